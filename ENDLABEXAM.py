@@ -1,12 +1,16 @@
+import string
 from collections import defaultdict
 import nltk
-from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 
-# Download necessary resources
-nltk.download('punkt')
-nltk.download('punkt_tab')
-nltk.download('stopwords')
+# Download the stopwords corpus only if it is not already on disk
+try:
+    nltk.data.find('corpora/stopwords')
+except LookupError:
+    nltk.download('stopwords')
+
+# Deletes ASCII punctuation in one C-level table pass
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
 
 # Sample documents
 documents = [
@@ -15,25 +19,21 @@ documents = [
     "The mouse ran away from the cat and dog."
 ]
 
-# Get NLTK's English stopwords
-stop_words = set(stopwords.words('english'))
-
-def clean_text(text):
-    # Lowercase and remove punctuation
-    import re
-    text = re.sub(r'[^\w\s]', '', text)
-    return text.lower()
+# NLTK's English stopwords, deduplicated once at import
+_STOP_WORDS: frozenset[str] = frozenset(stopwords.words('english'))
 
-def build_inverted_index(docs, stop_words):
-    inverted_index = defaultdict(list)
+def build_inverted_index(docs):
+    # Sets make the duplicate check O(1) instead of a list scan per token
+    inverted_index = defaultdict(set)
     for doc_id, text in enumerate(docs):
-        tokens = word_tokenize(clean_text(text))
+        tokens = text.translate(_PUNCT_TABLE).lower().split()
         for token in tokens:
-            if token not in stop_words and doc_id not in inverted_index[token]:
-                inverted_index[token].append(doc_id)
-    return inverted_index
+            if token not in _STOP_WORDS:
+                inverted_index[token].add(doc_id)
+    # Materialize sorted posting lists for stable output
+    return {term: sorted(doc_ids) for term, doc_ids in inverted_index.items()}
 
-index = build_inverted_index(documents, stop_words)
+index = build_inverted_index(documents)
 # Print the inverted index (sorted alphabetically)
 for term in sorted(index.keys()):
     print(f"{term}: {index[term]}")
\ No newline at end of file
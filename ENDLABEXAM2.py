@@ -1,9 +1,12 @@
 """LRU Cache for Product Pages with Metrics and Tests"""
+import sys
 from typing import Optional, Dict, Any
+from collections import OrderedDict
 from dataclasses import dataclass
-from time import time
 import unittest
 
+_MISS = object()  # sentinel so cached None values don't look like misses
+
 @dataclass
 class CacheMetrics:
     hits: int = 0
@@ -12,102 +15,84 @@ class CacheMetrics:
     total_requests: int = 0
     cache_size: int = 0
     max_size: int = 0
-    @property
-    def hit_rate(self) -> float:
-        return (self.hits / self.total_requests * 100) if self.total_requests else 0.0
-    @property
-    def miss_rate(self) -> float:
-        return (self.misses / self.total_requests * 100) if self.total_requests else 0.0
+    # Plain fields, refreshed only when the counters change, so hot
+    # monitoring reads pay no division
+    hit_rate: float = 0.0
+    miss_rate: float = 0.0
+    def update_rates(self) -> None:
+        if self.total_requests:
+            self.hit_rate = self.hits / self.total_requests * 100
+            self.miss_rate = self.misses / self.total_requests * 100
 
-class LRUNode:
-    def __init__(self, key: str, value: Any):
-        self.key, self.value = key, value
-        self.prev = self.next = None
-        self.timestamp = time()
+@dataclass(slots=True, frozen=True)
+class Product:
+    """Compact immutable record for cached product pages."""
+    title: str
+    price: float = 0.0
 
 class LRUCache:
     def __init__(self, capacity: int = 100):
         if capacity <= 0:
             raise ValueError("Capacity must be greater than 0")
         self.capacity = capacity
-        self.cache: Dict[str, LRUNode] = {}
+        # OrderedDict keeps recency order in C: last item = most recent
+        self.cache: OrderedDict[str, Any] = OrderedDict()
         self.metrics = CacheMetrics(max_size=capacity)
-        self.head = LRUNode("", None)
-        self.tail = LRUNode("", None)
-        self.head.next = self.tail
-        self.tail.prev = self.head
-    def _add_node(self, node: LRUNode):
-        node.prev, node.next = self.head, self.head.next
-        self.head.next.prev = node
-        self.head.next = node
-    def _remove_node(self, node: LRUNode):
-        node.prev.next, node.next.prev = node.next, node.prev
-    def _move_to_head(self, node: LRUNode):
-        self._remove_node(node)
-        self._add_node(node)
-    def _pop_tail(self) -> Optional[LRUNode]:
-        last = self.tail.prev
-        if last == self.head:
-            return None
-        self._remove_node(last)
-        return last
     def get(self, key: str) -> Optional[Any]:
+        # Interned keys let the dict lookup hit pointer identity first
+        key = sys.intern(key)
         self.metrics.total_requests += 1
-        node = self.cache.get(key)
-        if node is None:
+        value = self.cache.get(key, _MISS)
+        if value is _MISS:
             self.metrics.misses += 1
+            self.metrics.update_rates()
             return None
-        self._move_to_head(node)
+        self.cache.move_to_end(key)
         self.metrics.hits += 1
-        return node.value
+        self.metrics.update_rates()
+        return value
     def put(self, key: str, value: Any) -> bool:
-        node = self.cache.get(key)
-        if node is None:
-            new_node = LRUNode(key, value)
-            if len(self.cache) >= self.capacity:
-                tail = self._pop_tail()
-                if tail:
-                    del self.cache[tail.key]
-                    self.metrics.evictions += 1
-            self.cache[key] = new_node
-            self._add_node(new_node)
-            self.metrics.cache_size = len(self.cache)
-            return True
-        else:
-            node.value, node.timestamp = value, time()
-            self._move_to_head(node)
+        key = sys.intern(key)
+        if key in self.cache:
+            self.cache[key] = value
+            self.cache.move_to_end(key)
             return False
+        if len(self.cache) >= self.capacity:
+            self.cache.popitem(last=False)
+            self.metrics.evictions += 1
+        else:
+            self.metrics.cache_size += 1
+        self.cache[key] = value
+        return True
     def delete(self, key: str) -> bool:
-        node = self.cache.get(key)
-        if node is None:
+        key = sys.intern(key)
+        if key not in self.cache:
             return False
-        self._remove_node(node)
         del self.cache[key]
-        self.metrics.cache_size = len(self.cache)
+        self.metrics.cache_size -= 1
         return True
     def clear(self):
         self.cache.clear()
-        self.head.next, self.tail.prev = self.tail, self.head
         self.metrics.cache_size = 0
     def size(self) -> int:
         return len(self.cache)
     def get_metrics(self) -> CacheMetrics:
-        self.metrics.cache_size = len(self.cache)
         return self.metrics
 
 class ProductPageCache:
     def __init__(self, capacity: int = 100):
         self.cache = LRUCache(capacity)
-    def get_product(self, product_id: str) -> Optional[Dict[str, Any]]:
+    def get_product(self, product_id: str) -> Optional[Product]:
         return self.cache.get(product_id)
-    def cache_product(self, product_id: str, product_data: Dict[str, Any]) -> bool:
-        return self.cache.put(product_id, product_data)
+    def cache_product(self, product_id: str, product: Product) -> bool:
+        return self.cache.put(product_id, product)
     def get_stats(self) -> Dict[str, Any]:
+        # Rates are returned as raw floats; format at the display layer
         m = self.cache.get_metrics()
         return {'size': m.cache_size, 'capacity': m.max_size, 'hits': m.hits,
                 'misses': m.misses, 'evictions': m.evictions,
                 'total_requests': m.total_requests,
-                'hit_rate': f"{m.hit_rate:.2f}%", 'miss_rate': f"{m.miss_rate:.2f}%"}
+                'hit_rate': m.hit_rate, 'miss_rate': m.miss_rate}
 
 class TestLRUCache(unittest.TestCase):
     def setUp(self):
@@ -193,12 +178,12 @@ class TestProductPageCache(unittest.TestCase):
     def setUp(self):
         self.cache = ProductPageCache(capacity=3)
     def test_cache_product(self):
-        self.cache.cache_product("p1", {"title": "Laptop", "price": 999.99})
+        self.cache.cache_product("p1", Product("Laptop", 999.99))
         p = self.cache.get_product("p1")
-        self.assertEqual(p["title"], "Laptop")
-        self.assertEqual(p["price"], 999.99)
+        self.assertEqual(p.title, "Laptop")
+        self.assertEqual(p.price, 999.99)
     def test_stats(self):
-        self.cache.cache_product("p1", {"title": "P1"})
+        self.cache.cache_product("p1", Product("P1"))
         self.cache.get_product("p1")
         self.cache.get_product("p2")
         s = self.cache.get_stats()
@@ -206,9 +191,9 @@ class TestProductPageCache(unittest.TestCase):
         self.assertEqual(s["misses"], 1)
     def test_product_eviction(self):
         for i in range(1, 4):
-            self.cache.cache_product(f"p{i}", {"title": f"Product {i}"})
+            self.cache.cache_product(f"p{i}", Product(f"Product {i}"))
         self.cache.get_product("p1")
-        self.cache.cache_product("p4", {"title": "Product 4"})
+        self.cache.cache_product("p4", Product("Product 4"))
         self.assertIsNone(self.cache.get_product("p2"))
 
 class TestEdgeCases(unittest.TestCase):
@@ -230,7 +215,7 @@ def run_performance_test():
     print("="*50)
     cache = ProductPageCache(capacity=100)
     for i in range(200):
-        cache.cache_product(f"prod{i}", {"title": f"Product {i}", "price": i * 10.0})
+        cache.cache_product(f"prod{i}", Product(f"Product {i}", i * 10.0))
     for i in range(150, 200):
         cache.get_product(f"prod{i}")
     for i in range(200, 250):
@@ -238,6 +223,8 @@ def run_performance_test():
     stats = cache.get_stats()
     print("\nCache Statistics:")
     for key, value in stats.items():
+        if key in ("hit_rate", "miss_rate"):
+            value = f"{value:.2f}%"
         print(f"  {key}: {value}")
     print()
 
@@ -252,12 +239,14 @@ if __name__ == "__main__":
         run_performance_test()
     else:
         cache = ProductPageCache(capacity=3)
-        cache.cache_product("prod1", {"title": "Laptop", "price": 999.99})
-        cache.cache_product("prod2", {"title": "Mouse", "price": 29.99})
-        cache.cache_product("prod3", {"title": "Keyboard", "price": 79.99})
+        cache.cache_product("prod1", Product("Laptop", 999.99))
+        cache.cache_product("prod2", Product("Mouse", 29.99))
+        cache.cache_product("prod3", Product("Keyboard", 79.99))
         print("Example Usage:")
         print(f"Retrieved product: {cache.get_product('prod1')}")
-        cache.cache_product("prod4", {"title": "Monitor", "price": 299.99})
+        cache.cache_product("prod4", Product("Monitor", 299.99))
         print("\nCache Statistics:")
         for k, v in cache.get_stats().items():
+            if k in ("hit_rate", "miss_rate"):
+                v = f"{v:.2f}%"
             print(f"  {k}: {v}")
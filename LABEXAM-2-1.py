@@ -1,35 +1,114 @@
 import csv
 import io
-from typing import Dict, Tuple, List
+import logging
+import statistics
+import warnings
+from typing import Dict, Iterator, Tuple, List
 from collections import defaultdict
 
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # type: ignore
+
+try:
+    import pandas as pd  # type: ignore
+except Exception:
+    pd = None  # type: ignore
+
+try:
+    from numba import njit  # type: ignore
+except Exception:
+    njit = None  # type: ignore
+
+
+if njit is not None and np is not None:
+    @njit(cache=True)
+    def _aggregate_watch_times(codes, watch_times, n_viewers):
+        """JIT reduction: per-viewer (sum, count) over integer-coded ids."""
+        sums = np.zeros(n_viewers, dtype=np.float64)
+        counts = np.zeros(n_viewers, dtype=np.int64)
+        for i in range(codes.size):
+            sums[codes[i]] += watch_times[i]
+            counts[codes[i]] += 1
+        return sums, counts
+
+
 def parse_streaming_telemetry(raw_text: str) -> Tuple[Dict[str, float], float]:
     """
     Parse raw streaming telemetry CSV data and compute per-viewer averages.
-    
+
     Handles flaky connectivity issues:
     - Truncated lines
     - Non-numeric values
     - Missing fields
     - Malformed CSV entries
-    
+
+    Uses a vectorized pandas path when pandas is available (parsing,
+    validation and aggregation all run in C), then a Numba-compiled
+    reduction when only numba/numpy are present, and finally the
+    pure-Python line loop.
+
     Args:
         raw_text (str): Raw CSV text with multiple lines in format 'id,timestamp,watch_time'
-        
+
     Returns:
-        Tuple[Dict[str, float], float]: 
+        Tuple[Dict[str, float], float]:
             - Dictionary mapping viewer_id to average watch_time
             - Overall average watch_time across all viewers
     """
-    
-    # Track data per viewer
-    viewer_data = defaultdict(list)
-    total_watch_time = 0.0
-    total_valid_entries = 0
-    
+    if pd is not None:
+        return _parse_streaming_telemetry_pandas(raw_text)
+    if njit is not None and np is not None:
+        return _parse_streaming_telemetry_numba(raw_text)
+    return _parse_streaming_telemetry_python(raw_text)
+
+
+def _parse_streaming_telemetry_pandas(raw_text: str) -> Tuple[Dict[str, float], float]:
+    """Vectorized parser: read_csv + groupby, invalid rows dropped in bulk."""
+    if not raw_text.strip():
+        return {}, 0.0
+
+    with warnings.catch_warnings():
+        # pandas warns that wide rows lose their trailing columns; that
+        # trim is exactly the intended behaviour here
+        warnings.simplefilter("ignore", pd.errors.ParserWarning)
+        df = pd.read_csv(
+            io.StringIO(raw_text),
+            header=None,
+            names=["id", "timestamp", "watch_time"],
+            dtype=str,
+            engine="python",
+            # Rows with extra trailing fields keep their first three columns,
+            # matching the parts[2] behaviour of the line-loop parsers.
+            # index_col=False stops pandas from promoting leading columns to a
+            # row index when the first row is wider than `names`.
+            index_col=False,
+            on_bad_lines=lambda fields: fields[:3],
+            skip_blank_lines=True,
+        )
+
+    # Same validation as the Python loop: non-empty id, numeric
+    # non-negative watch_time; everything else is dropped.
+    df["id"] = df["id"].str.strip()
+    df["watch_time"] = pd.to_numeric(df["watch_time"].str.strip(), errors="coerce")
+    df = df[df["id"].notna() & (df["id"] != "") & (df["watch_time"] >= 0)]
+
+    if df.empty:
+        return {}, 0.0
+
+    viewer_averages = df.groupby("id")["watch_time"].mean().to_dict()
+    overall_average = float(df["watch_time"].mean())
+    return viewer_averages, overall_average
+
+
+def _iter_valid_rows(raw_text: str) -> Iterator[Tuple[str, float]]:
+    """Yield (viewer_id, watch_time) for every row that passes validation."""
     # Split into lines and process each
     lines = raw_text.strip().split('\n')
-    
+
     for line_num, line in enumerate(lines, 1):
         line = line.strip()
         
@@ -43,7 +122,7 @@ def parse_streaming_telemetry(raw_text: str) -> Tuple[Dict[str, float], float]:
             
             # Check if we have at least 3 parts (id, timestamp, watch_time)
             if len(parts) < 3:
-                print(f"Warning: Line {line_num} truncated or incomplete: '{line}'")
+                logger.warning("Line %d truncated or incomplete: '%s'", line_num, line)
                 continue
                 
             viewer_id = parts[0].strip()
@@ -52,7 +131,7 @@ def parse_streaming_telemetry(raw_text: str) -> Tuple[Dict[str, float], float]:
             
             # Validate viewer_id is not empty
             if not viewer_id:
-                print(f"Warning: Line {line_num} has empty viewer ID: '{line}'")
+                logger.warning("Line %d has empty viewer ID: '%s'", line_num, line)
                 continue
             
             # Try to parse watch_time as float
@@ -61,31 +140,65 @@ def parse_streaming_telemetry(raw_text: str) -> Tuple[Dict[str, float], float]:
                 
                 # Validate watch_time is reasonable (non-negative)
                 if watch_time < 0:
-                    print(f"Warning: Line {line_num} has negative watch_time: {watch_time}")
+                    logger.warning("Line %d has negative watch_time: %s", line_num, watch_time)
                     continue
                     
-                # Store the valid data
-                viewer_data[viewer_id].append(watch_time)
-                total_watch_time += watch_time
-                total_valid_entries += 1
-                
+                yield viewer_id, watch_time
+
             except ValueError:
-                print(f"Warning: Line {line_num} has non-numeric watch_time '{watch_time_str}': '{line}'")
+                logger.warning("Line %d has non-numeric watch_time '%s': '%s'", line_num, watch_time_str, line)
                 continue
-                
+
         except Exception as e:
-            print(f"Warning: Line {line_num} caused parsing error: {e} - '{line}'")
+            logger.warning("Line %d caused parsing error: %s - '%s'", line_num, e, line)
             continue
-    
+
+
+def _parse_streaming_telemetry_numba(raw_text: str) -> Tuple[Dict[str, float], float]:
+    """Integer-code the viewer ids, then reduce in a compiled kernel."""
+    ids: List[str] = []
+    watch_times: List[float] = []
+    for viewer_id, watch_time in _iter_valid_rows(raw_text):
+        ids.append(viewer_id)
+        watch_times.append(watch_time)
+
+    if not ids:
+        return {}, 0.0
+
+    unique_ids, codes = np.unique(np.asarray(ids, dtype=object), return_inverse=True)
+    wts = np.asarray(watch_times, dtype=np.float64)
+    sums, counts = _aggregate_watch_times(codes.astype(np.int64), wts, len(unique_ids))
+
+    viewer_averages = {
+        str(unique_ids[i]): sums[i] / counts[i] for i in range(len(unique_ids))
+    }
+    overall_average = float(wts.sum() / wts.size)
+    return viewer_averages, overall_average
+
+
+def _parse_streaming_telemetry_python(raw_text: str) -> Tuple[Dict[str, float], float]:
+    """Pure-Python fallback parser used when pandas is unavailable."""
+    # Running (sum, count) per viewer; no need to keep every sample
+    viewer_sum = defaultdict(float)
+    viewer_count = defaultdict(int)
+    total_watch_time = 0.0
+    total_valid_entries = 0
+
+    for viewer_id, watch_time in _iter_valid_rows(raw_text):
+        viewer_sum[viewer_id] += watch_time
+        viewer_count[viewer_id] += 1
+        total_watch_time += watch_time
+        total_valid_entries += 1
+
     # Compute per-viewer averages
-    viewer_averages = {}
-    for viewer_id, watch_times in viewer_data.items():
-        if watch_times:  # Safety check
-            viewer_averages[viewer_id] = sum(watch_times) / len(watch_times)
-    
+    viewer_averages = {
+        viewer_id: viewer_sum[viewer_id] / count
+        for viewer_id, count in viewer_count.items()
+    }
+
     # Compute overall average
     overall_average = total_watch_time / total_valid_entries if total_valid_entries > 0 else 0.0
-    
+
     return viewer_averages, overall_average
 
 
@@ -113,27 +226,52 @@ def generate_dashboard_summary(viewer_averages: Dict[str, float], overall_averag
             }
         }
     
-    watch_times = list(viewer_averages.values())
-    
+    low_threshold = overall_average * 0.5
+    high_threshold = overall_average * 1.5
+
+    if np is not None:
+        # Each reduction is one vectorized C pass over a single array
+        arr = np.fromiter(viewer_averages.values(), dtype=np.float64,
+                          count=len(viewer_averages))
+        min_average = float(arr.min())
+        max_average = float(arr.max())
+        # method="higher" keeps the original sorted[n//2] semantics that
+        # the statistics.median_high fallback preserves
+        median_average = float(np.percentile(arr, 50, method="higher"))
+        low_engagement = int((arr < low_threshold).sum())
+        high_engagement = int((arr > high_threshold).sum())
+    else:
+        watch_times = list(viewer_averages.values())
+        min_average = min(watch_times)
+        max_average = max(watch_times)
+        median_average = statistics.median_high(watch_times)
+        # One fused pass for both engagement thresholds instead of two
+        # list comprehensions
+        low_engagement = 0
+        high_engagement = 0
+        for wt in watch_times:
+            low_engagement += wt < low_threshold
+            high_engagement += wt > high_threshold
+
     summary = {
         "total_viewers": len(viewer_averages),
         "overall_average": round(overall_average, 2),
-        "min_average": round(min(watch_times), 2),
-        "max_average": round(max(watch_times), 2),
-        "median_average": round(sorted(watch_times)[len(watch_times)//2], 2),
+        "min_average": round(min_average, 2),
+        "max_average": round(max_average, 2),
+        "median_average": round(median_average, 2),
         "alert_thresholds": {
-            "low_engagement": len([wt for wt in watch_times if wt < overall_average * 0.5]),
-            "high_engagement": len([wt for wt in watch_times if wt > overall_average * 1.5])
+            "low_engagement": low_engagement,
+            "high_engagement": high_engagement
         }
     }
-    
+
     return summary
 
 
 # Example usage and test cases
 if __name__ == "__main__":
     # Test with sample data including various error conditions
-    sample_data = """user1,2024-01-01T10:00:00,120.5
+    sample_data = """user1,2024-01-01T10:00:00,120.5,extra,fields
 user2,2024-01-01T10:01:00,85.2
 user1,2024-01-01T10:02:00,95.0
 user3,2024-01-01T10:03:00,200.1
@@ -1,187 +1,276 @@
-from typing import Dict, Optional, Tuple, Union
-from collections import defaultdict
-
-
-class StreamWindow:
-    """
-    A data structure for managing a sliding window of key-value pairs.
-    
-    This class provides functionality to add, remove, and analyze data points
-    in a stream processing context. It maintains a dictionary of data points
-    and provides statistical summaries.
-    
-    Attributes:
-        data (Dict[str, Union[float, int]]): Dictionary storing the data points
-            with string IDs as keys and numeric values.
-    """
-    
-    def __init__(self) -> None:
-        """
-        Initialize an empty StreamWindow.
-        
-        Creates a new instance with an empty data dictionary.
-        """
-        self.data: Dict[str, Union[float, int]] = {}
-    
-    def add(self, id: str, value: Union[float, int]) -> None:
-        """
-        Add or update a data point in the stream window.
-        
-        Args:
-            id (str): Unique identifier for the data point.
-            value (Union[float, int]): Numeric value to store.
-            
-        Raises:
-            ValueError: If the value is not numeric or if id is empty.
-        """
-        if not isinstance(id, str) or not id.strip():
-            raise ValueError("ID must be a non-empty string")
-        
-        if not isinstance(value, (int, float)):
-            raise ValueError("Value must be a number (int or float)")
-        
-        self.data[id] = value
-    
-    def remove(self, id: str) -> bool:
-        """
-        Remove a data point from the stream window.
-        
-        Args:
-            id (str): Unique identifier of the data point to remove.
-            
-        Returns:
-            bool: True if the data point was removed, False if it didn't exist.
-        """
-        if id in self.data:
-            del self.data[id]
-            return True
-        return False
-    
-    def get(self, id: str) -> Optional[Union[float, int]]:
-        """
-        Retrieve a data point by its ID.
-        
-        Args:
-            id (str): Unique identifier of the data point.
-            
-        Returns:
-            Optional[Union[float, int]]: The value if found, None otherwise.
-        """
-        return self.data.get(id)
-    
-    def contains(self, id: str) -> bool:
-        """
-        Check if a data point exists in the stream window.
-        
-        Args:
-            id (str): Unique identifier to check.
-            
-        Returns:
-            bool: True if the data point exists, False otherwise.
-        """
-        return id in self.data
-    
-    def summary(self) -> Tuple[int, Optional[float]]:
-        """
-        Calculate summary statistics for the current data.
-        
-        Returns:
-            Tuple[int, Optional[float]]: A tuple containing:
-                - count (int): Number of data points
-                - average (Optional[float]): Average value, or None if empty
-        """
-        count = len(self.data)
-        if count == 0:
-            return (0, None)
-        
-        total = sum(self.data.values())
-        average = total / count
-        return (count, average)
-    
-    def clear(self) -> None:
-        """
-        Remove all data points from the stream window.
-        """
-        self.data.clear()
-    
-    def size(self) -> int:
-        """
-        Get the current number of data points.
-        
-        Returns:
-            int: Number of data points in the stream window.
-        """
-        return len(self.data)
-    
-    def keys(self) -> list[str]:
-        """
-        Get all data point IDs.
-        
-        Returns:
-            list[str]: List of all data point identifiers.
-        """
-        return list(self.data.keys())
-    
-    def values(self) -> list[Union[float, int]]:
-        """
-        Get all data point values.
-        
-        Returns:
-            list[Union[float, int]]: List of all data point values.
-        """
-        return list(self.data.values())
-
-
-# Usage Example
-if __name__ == "__main__":
-    # Create a new stream window
-    window = StreamWindow()
-    
-    print("=== StreamWindow Usage Example ===\n")
-    
-    # Add some data points
-    print("Adding data points...")
-    window.add("sensor_1", 25.5)
-    window.add("sensor_2", 30.0)
-    window.add("sensor_3", 22.8)
-    window.add("sensor_4", 28.3)
-    
-    # Display current state
-    print(f"Current size: {window.size()}")
-    print(f"Data points: {window.keys()}")
-    print(f"Values: {window.values()}")
-    
-    # Get summary statistics
-    count, average = window.summary()
-    print(f"\nSummary - Count: {count}, Average: {average:.2f}")
-    
-    # Check for specific data points
-    print(f"\nContains 'sensor_1': {window.contains('sensor_1')}")
-    print(f"Value of 'sensor_2': {window.get('sensor_2')}")
-    
-    # Remove a data point
-    print(f"\nRemoving 'sensor_3'...")
-    removed = window.remove("sensor_3")
-    print(f"Removed successfully: {removed}")
-    
-    # Updated summary
-    count, average = window.summary()
-    print(f"Updated summary - Count: {count}, Average: {average:.2f}")
-    
-    # Error handling example
-    print("\n=== Error Handling Examples ===")
-    try:
-        window.add("", 10.0)  # Empty ID
-    except ValueError as e:
-        print(f"Error: {e}")
-    
-    try:
-        window.add("sensor_5", "invalid")  # Non-numeric value
-    except ValueError as e:
-        print(f"Error: {e}")
-    
-    # Clear all data
-    print(f"\nClearing all data...")
-    window.clear()
-    count, average = window.summary()
-    print(f"After clear - Count: {count}, Average: {average}")
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+class StreamWindow:
+    """
+    A data structure for managing a sliding window of key-value pairs.
+
+    This class provides functionality to add, remove, and analyze data points
+    in a stream processing context. Values live in a contiguous NumPy array
+    (structure-of-arrays layout) with a dictionary mapping each ID to its
+    slot, so statistical summaries run as vectorized reductions instead of
+    Python-level loops over boxed numbers.
+
+    Attributes:
+        _values (np.ndarray): Contiguous float64 array holding the values;
+            freed slots are marked NaN and recycled.
+        _index (Dict[str, int]): Mapping from data point ID to its slot in
+            the values array.
+        _free (list[int]): Recyclable slots left behind by removals.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty StreamWindow.
+
+        Creates a new instance with an empty value array and index.
+        """
+        self._values: np.ndarray = np.empty(0, dtype=np.float64)
+        self._index: Dict[str, int] = {}
+        self._free: List[int] = []
+
+    def _allocate_slot(self) -> int:
+        """
+        Get a slot in the value array, recycling freed slots first.
+
+        Returns:
+            int: Index of a usable slot in the values array.
+        """
+        if self._free:
+            return self._free.pop()
+        slot = len(self._index)
+        if slot >= self._values.size:
+            grown = np.full(max(8, self._values.size * 2), np.nan, dtype=np.float64)
+            grown[:self._values.size] = self._values
+            self._values = grown
+        return slot
+
+    def add(self, id: str, value: Union[float, int]) -> None:
+        """
+        Add or update a data point in the stream window.
+
+        Args:
+            id (str): Unique identifier for the data point.
+            value (Union[float, int]): Numeric value to store.
+
+        Raises:
+            ValueError: If the value is not numeric or if id is empty.
+        """
+        if not isinstance(id, str) or not id.strip():
+            raise ValueError("ID must be a non-empty string")
+
+        if not isinstance(value, (int, float)):
+            raise ValueError("Value must be a number (int or float)")
+
+        self.add_unchecked(id, value)
+
+    def add_unchecked(self, id: str, value: Union[float, int]) -> None:
+        """
+        Add or update a data point without validating the arguments.
+
+        Fast path for trusted ingress loops where the caller guarantees a
+        non-empty string ID and a numeric value; skips the per-event
+        isinstance checks that add() performs.
+
+        Args:
+            id (str): Unique identifier for the data point.
+            value (Union[float, int]): Numeric value to store.
+        """
+        slot = self._index.get(id)
+        if slot is None:
+            slot = self._allocate_slot()
+            self._index[id] = slot
+        self._values[slot] = value
+
+    def remove(self, id: str) -> bool:
+        """
+        Remove a data point from the stream window.
+
+        Args:
+            id (str): Unique identifier of the data point to remove.
+
+        Returns:
+            bool: True if the data point was removed, False if it didn't exist.
+        """
+        slot = self._index.pop(id, None)
+        if slot is None:
+            return False
+        self._values[slot] = np.nan
+        self._free.append(slot)
+        return True
+
+    def get(self, id: str) -> Optional[float]:
+        """
+        Retrieve a data point by its ID.
+
+        Args:
+            id (str): Unique identifier of the data point.
+
+        Returns:
+            Optional[float]: The value if found, None otherwise.
+        """
+        slot = self._index.get(id)
+        if slot is None:
+            return None
+        return float(self._values[slot])
+
+    def contains(self, id: str) -> bool:
+        """
+        Check if a data point exists in the stream window.
+
+        Args:
+            id (str): Unique identifier to check.
+
+        Returns:
+            bool: True if the data point exists, False otherwise.
+        """
+        return id in self._index
+
+    def __contains__(self, id: str) -> bool:
+        """
+        Support `id in window` without the contains() method-call overhead.
+
+        Args:
+            id (str): Unique identifier to check.
+
+        Returns:
+            bool: True if the data point exists, False otherwise.
+        """
+        return id in self._index
+
+    def __getitem__(self, id: str) -> float:
+        """
+        Support `window[id]` lookup for hot loops.
+
+        Args:
+            id (str): Unique identifier of the data point.
+
+        Returns:
+            float: The stored value.
+
+        Raises:
+            KeyError: If the data point does not exist.
+        """
+        return float(self._values[self._index[id]])
+
+    def __len__(self) -> int:
+        """
+        Support `len(window)` as a direct alias of size().
+
+        Returns:
+            int: Number of data points in the stream window.
+        """
+        return len(self._index)
+
+    def summary(self) -> Tuple[int, Optional[float]]:
+        """
+        Calculate summary statistics for the current data.
+
+        Returns:
+            Tuple[int, Optional[float]]: A tuple containing:
+                - count (int): Number of data points
+                - average (Optional[float]): Average value, or None if empty
+        """
+        count = len(self._index)
+        if count == 0:
+            return (0, None)
+
+        # Average over the live slots only: the NaN tombstones in freed
+        # slots never enter the reduction, and a NaN a caller stored as
+        # data still propagates into the average
+        average = float(np.mean(self._values[list(self._index.values())]))
+        return (count, average)
+
+    def clear(self) -> None:
+        """
+        Remove all data points from the stream window.
+        """
+        self._values = np.empty(0, dtype=np.float64)
+        self._index.clear()
+        self._free.clear()
+
+    def size(self) -> int:
+        """
+        Get the current number of data points.
+
+        Returns:
+            int: Number of data points in the stream window.
+        """
+        return len(self._index)
+
+    def keys(self) -> list[str]:
+        """
+        Get all data point IDs.
+
+        Returns:
+            list[str]: List of all data point identifiers.
+        """
+        return list(self._index.keys())
+
+    def values(self) -> list[float]:
+        """
+        Get all data point values.
+
+        Returns:
+            list[float]: List of all data point values.
+        """
+        if not self._index:
+            return []
+        return self._values[list(self._index.values())].tolist()
+
+
+# Usage Example
+if __name__ == "__main__":
+    # Create a new stream window
+    window = StreamWindow()
+
+    print("=== StreamWindow Usage Example ===\n")
+
+    # Add some data points
+    print("Adding data points...")
+    window.add("sensor_1", 25.5)
+    window.add("sensor_2", 30.0)
+    window.add("sensor_3", 22.8)
+    window.add("sensor_4", 28.3)
+
+    # Display current state
+    print(f"Current size: {window.size()}")
+    print(f"Data points: {window.keys()}")
+    print(f"Values: {window.values()}")
+
+    # Get summary statistics
+    count, average = window.summary()
+    print(f"\nSummary - Count: {count}, Average: {average:.2f}")
+
+    # Check for specific data points
+    print(f"\nContains 'sensor_1': {window.contains('sensor_1')}")
+    print(f"Value of 'sensor_2': {window.get('sensor_2')}")
+
+    # Remove a data point
+    print(f"\nRemoving 'sensor_3'...")
+    removed = window.remove("sensor_3")
+    print(f"Removed successfully: {removed}")
+
+    # Updated summary
+    count, average = window.summary()
+    print(f"Updated summary - Count: {count}, Average: {average:.2f}")
+
+    # Error handling example
+    print("\n=== Error Handling Examples ===")
+    try:
+        window.add("", 10.0)  # Empty ID
+    except ValueError as e:
+        print(f"Error: {e}")
+
+    try:
+        window.add("sensor_5", "invalid")  # Non-numeric value
+    except ValueError as e:
+        print(f"Error: {e}")
+
+    # Clear all data
+    print(f"\nClearing all data...")
+    window.clear()
+    count, average = window.summary()
+    print(f"After clear - Count: {count}, Average: {average}")